@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import streamlit as st
 
 from stock_sentiment_tracker.analysis import (
+    SummaryMetrics,
     build_wordcloud,
     distribution,
     platform_breakdown,
@@ -41,6 +45,38 @@ def _keys_status(keys: APIKeys) -> dict[str, bool]:
     }
 
 
+def _top_rows(df: pd.DataFrame, column: str, n: int) -> pd.DataFrame:
+    """
+    Top-n rows by `column`, descending, without sorting the whole frame.
+    """
+    if n >= len(df):
+        return df.sort_values(column, ascending=False)
+    values = df[column].to_numpy()
+    idx = np.argpartition(-values, n)[:n]
+    idx = idx[np.argsort(-values[idx])]
+    return df.iloc[idx]
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _csv_bytes(_df: pd.DataFrame, ticker: str, shape: tuple[int, int], compound_sum: float) -> bytes:
+    """
+    CSV export, serialized once per dataset with PyArrow's CSV writer.
+    `_df` is not hashed by Streamlit; the remaining args identify the dataset.
+    """
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _aggregates(df: pd.DataFrame) -> tuple[SummaryMetrics, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Summary, platform breakdown, distribution and daily series for a result set.
+    Pure functions of `df`, so widget-only reruns reuse them.
+    """
+    return summarize(df), platform_breakdown(df), distribution(df), time_series(df, freq="D")
+
+
 @st.cache_data(ttl=600, show_spinner=False)
 def _run_fetch_and_analyze(
     ticker: str,
@@ -54,6 +90,7 @@ def _run_fetch_and_analyze(
     stocktwits_limit: int,
     enable_finnhub: bool,
     finnhub_days: int,
+    force_refresh: bool,
     # cache_bust can be changed to force rerun without leaking secrets
     cache_bust: int,
 ) -> tuple[pd.DataFrame, list[str], dict | None]:
@@ -71,6 +108,7 @@ def _run_fetch_and_analyze(
         stocktwits_limit=stocktwits_limit,
         enable_finnhub=enable_finnhub,
         finnhub_days=finnhub_days,
+        force_refresh=force_refresh,
     )
     df = analyze_items(result.items)
     finnhub = None
@@ -87,6 +125,39 @@ def _run_fetch_and_analyze(
     return df, result.warnings, finnhub
 
 
+# Fragments: moving their sliders reruns only the fragment, not the whole page.
+@st.fragment
+def _topics_section(df: pd.DataFrame) -> None:
+    st.subheader("Topic modeling (NMF)")
+    n_topics = st.slider("Topics", 5, 10, 6, 1)
+    topics = topics_nmf(df["text"].tolist(), n_topics=int(n_topics), top_words=8)
+    if not topics:
+        st.info("Not enough text to extract stable topics yet.")
+    else:
+        for t in topics:
+            st.write(f"**Topic {t['topic']}**: " + ", ".join(t["terms"]))
+
+
+@st.fragment
+def _sample_table_section(df: pd.DataFrame, ticker: str) -> None:
+    st.subheader("Sample posts/comments with sentiment")
+    show_n = st.slider("Rows to display", 20, 300, 100, 10)
+    view = _top_rows(df, "compound", int(show_n))
+    st.dataframe(
+        view[["platform", "created_at", "compound", "pos", "neu", "neg", "text", "url"]],
+        use_container_width=True,
+        height=420,
+    )
+
+    csv_bytes = _csv_bytes(df, ticker, df.shape, float(df["compound"].sum()))
+    st.download_button(
+        label="Download all results as CSV",
+        data=csv_bytes,
+        file_name=f"{ticker}_sentiment.csv",
+        mime="text/csv",
+    )
+
+
 with st.sidebar:
     st.subheader("Inputs")
     ticker_in = st.text_input("Stock ticker", value="AAPL", help="Example: AAPL, TSLA, MSFT")
@@ -117,6 +188,9 @@ with st.sidebar:
 
     st.divider()
     cache_bust = st.number_input("Cache bust (increment to force refresh)", min_value=0, value=0, step=1)
+    force_refresh = st.checkbox(
+        "Bypass on-disk API cache", value=False, help="Refetch even if a fresh response is cached."
+    )
     if st.button("Clear Streamlit cache"):
         st.cache_data.clear()
         st.success("Cache cleared.")
@@ -143,8 +217,15 @@ if run:
             stocktwits_limit=int(stocktwits_limit),
             enable_finnhub=bool(enable_finnhub),
             finnhub_days=int(finnhub_days),
+            force_refresh=bool(force_refresh),
             cache_bust=int(cache_bust),
         )
+    # Keep the last result so reruns triggered by other widgets still render it.
+    st.session_state["results"] = (ticker, df, warnings, finnhub)
+
+results = st.session_state.get("results")
+if results is not None and results[0] == ticker:
+    _, df, warnings, finnhub = results
 
     for w in warnings:
         st.warning(w)
@@ -153,10 +234,8 @@ if run:
         st.info("No text items were collected. Try increasing limits or adding API keys.")
         st.stop()
 
-    summary = summarize(df)
-    breakdown = platform_breakdown(df)
-    dist = distribution(df)
-    ts = time_series(df, freq="D")
+    # Only the columns the aggregates read, to keep Streamlit's cache-key hash cheap.
+    summary, breakdown, dist, ts = _aggregates(df[["platform", "created_at", "text", "compound", "sent_code"]])
 
     # ---- Summary ----
     c1, c2, c3, c4 = st.columns(4)
@@ -215,17 +294,24 @@ if run:
             title="Sentiment by platform (avg compound)",
             labels={"avg_compound": "Avg compound", "mentions": "Mentions"},
         )
-        fig_bar.update_layout(height=380)
+        fig_bar.update_layout(height=380, uirevision="keep")
         st.plotly_chart(fig_bar, use_container_width=True)
 
     with v2:
         fig_pie = px.pie(dist, names="sentiment", values="count", title="Sentiment distribution")
-        fig_pie.update_layout(height=380)
+        fig_pie.update_layout(height=380, uirevision="keep")
         st.plotly_chart(fig_pie, use_container_width=True)
 
     if not ts.empty:
-        fig_line = px.line(ts, x="time", y="avg_compound", markers=True, title="Sentiment over time (avg compound)")
-        fig_line.update_layout(height=340)
+        fig_line = px.line(
+            ts,
+            x="time",
+            y="avg_compound",
+            markers=True,
+            render_mode="webgl",
+            title="Sentiment over time (avg compound)",
+        )
+        fig_line.update_layout(height=340, uirevision="keep")
         st.plotly_chart(fig_line, use_container_width=True)
     else:
         st.info("No timestamps available to plot sentiment over time.")
@@ -235,21 +321,14 @@ if run:
     # ---- Topics + Word clouds ----
     left, right = st.columns([1, 1])
     with left:
-        st.subheader("Topic modeling (NMF)")
-        n_topics = st.slider("Topics", 5, 10, 6, 1)
-        topics = topics_nmf(df["text"].tolist(), n_topics=int(n_topics), top_words=8)
-        if not topics:
-            st.info("Not enough text to extract stable topics yet.")
-        else:
-            for t in topics:
-                st.write(f"**Topic {t['topic']}**: " + ", ".join(t["terms"]))
+        _topics_section(df)
 
     with right:
         st.subheader("Word clouds")
-        pos_texts = df.loc[df["compound"] >= 0.05, "text"].tolist()
-        neg_texts = df.loc[df["compound"] <= -0.05, "text"].tolist()
-        wc_pos = build_wordcloud(pos_texts)
-        wc_neg = build_wordcloud(neg_texts)
+        pos_texts = df.loc[df["sent_code"] == 2, "text"].tolist()
+        neg_texts = df.loc[df["sent_code"] == 0, "text"].tolist()
+        wc_pos = build_wordcloud(pos_texts, clean=False)
+        wc_neg = build_wordcloud(neg_texts, clean=False)
 
         cpos, cneg = st.columns(2)
         with cpos:
@@ -268,22 +347,7 @@ if run:
     st.divider()
 
     # ---- Sample table + export ----
-    st.subheader("Sample posts/comments with sentiment")
-    show_n = st.slider("Rows to display", 20, 300, 100, 10)
-    view = df.sort_values("compound", ascending=False).head(int(show_n))
-    st.dataframe(
-        view[["platform", "created_at", "compound", "pos", "neu", "neg", "text", "url"]],
-        use_container_width=True,
-        height=420,
-    )
-
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label="Download all results as CSV",
-        data=csv_bytes,
-        file_name=f"{ticker}_sentiment.csv",
-        mime="text/csv",
-    )
+    _sample_table_section(df, ticker)
 
 else:
     st.info("Enter a ticker and click **Fetch & Analyze**.")
@@ -1,21 +1,28 @@
 from __future__ import annotations
+import re
+import string
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 
 import nltk
+import numpy as np
 import pandas as pd
 from nltk.sentiment import SentimentIntensityAnalyzer
 from sklearn.decomposition import NMF
 from sklearn.feature_extraction.text import TfidfVectorizer
-from wordcloud import WordCloud
+from wordcloud import STOPWORDS, WordCloud
+from wordcloud.tokenization import process_tokens
 
-from stock_sentiment_tracker.models import TextItem
+from stock_sentiment_tracker.models import TextItem, items_to_columns
 from stock_sentiment_tracker.utils import clean_text
 
 
+@lru_cache(maxsize=1)
 def ensure_nltk() -> None:
     """
     Downloads required NLTK data if missing.
-    This is safe to run multiple times.
+    Runs once per process; later calls are no-ops.
     """
     required = {
         "vader_lexicon": "sentiment/vader_lexicon",
@@ -29,39 +36,67 @@ def ensure_nltk() -> None:
             nltk.download(pkg, quiet=True)
 
 
+@lru_cache(maxsize=1)
 def vader_analyzer() -> SentimentIntensityAnalyzer:
+    """
+    Shared analyzer, so the VADER lexicon is parsed once per process
+    rather than on every Streamlit rerun.
+    """
     ensure_nltk()
     return SentimentIntensityAnalyzer()
 
 
+@lru_cache(maxsize=1)
+def _vader_lexicon() -> frozenset[str]:
+    return frozenset(vader_analyzer().lexicon)
+
+
+_ITEM_COLUMNS = ["platform", "created_at", "text", "url", "author", "external_id"]
+_SCORE_COLUMNS = ["compound", "pos", "neu", "neg"]
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+_NEUTRAL_SCORES = {"compound": 0.0, "pos": 0.0, "neu": 1.0, "neg": 0.0}
+_EMPTY_SCORES = {"compound": 0.0, "pos": 0.0, "neu": 0.0, "neg": 0.0}
+
+
+def _vader_scores(texts: pd.Series) -> pd.DataFrame:
+    """
+    Score texts with VADER, skipping texts that contain no lexicon word.
+    VADER looks a lowercased token up as-is or with punctuation removed, and only
+    lexicon hits carry valence; every other text scores compound=pos=neg=0, with
+    neu=1 when it has at least one multi-character token. The check is two set
+    disjointness tests per text; it may over-match (those texts are simply scored),
+    never under-match, and texts that do hit pay almost nothing extra.
+    """
+    lexicon = _vader_lexicon()
+    polarity_scores = vader_analyzer().polarity_scores
+    rows = []
+    for text in texts:
+        lowered = text.lower()
+        if lexicon.isdisjoint(lowered.split()) and lexicon.isdisjoint(lowered.translate(_PUNCT_TABLE).split()):
+            rows.append(_NEUTRAL_SCORES if any(len(w) > 1 for w in text.split()) else _EMPTY_SCORES)
+        else:
+            rows.append(polarity_scores(text))
+    return pd.DataFrame(rows, index=texts.index, columns=_SCORE_COLUMNS)
+
+
 def analyze_items(items: list[TextItem]) -> pd.DataFrame:
     """
-    Convert items to a dataframe and apply VADER to each row.
-    """
-    sia = vader_analyzer()
-    rows: list[dict] = []
-    for it in items:
-        txt = clean_text(it.text)
-        if not txt:
-            continue
-        scores = sia.polarity_scores(txt)
-        rows.append(
-            {
-                "platform": it.platform,
-                "created_at": it.created_at,
-                "text": txt,
-                "url": it.url,
-                "author": it.author,
-                "external_id": it.external_id,
-                "compound": float(scores.get("compound", 0.0)),
-                "pos": float(scores.get("pos", 0.0)),
-                "neu": float(scores.get("neu", 0.0)),
-                "neg": float(scores.get("neg", 0.0)),
-            }
-        )
-    df = pd.DataFrame(rows)
-    if not df.empty and "created_at" in df.columns:
-        df["created_at"] = pd.to_datetime(df["created_at"], utc=True, errors="coerce")
+    Convert items to a dataframe and apply VADER to the cleaned text column.
+    """
+    # Clean and drop empty texts in one pass, then build the columns from the survivors.
+    kept = [(it, txt) for it in items if it.text and (txt := clean_text(it.text))]
+    columns = items_to_columns([it for it, _ in kept])
+    columns["text"] = [txt for _, txt in kept]
+    df = pd.DataFrame(columns, columns=_ITEM_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=_ITEM_COLUMNS + _SCORE_COLUMNS + ["sent_code"])
+
+    df = pd.concat([df, _vader_scores(df["text"])], axis=1)
+    df["sent_code"] = sentiment_codes(df["compound"])
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True, errors="coerce")
+    # Few distinct values, many rows: store as integer codes.
+    df["platform"] = df["platform"].astype("category")
+    df["author"] = df["author"].astype("category")
     return df
 
 
@@ -73,6 +108,23 @@ def label_sentiment(compound: float) -> str:
     return "neutral"
 
 
+def sentiment_codes(compound: pd.Series) -> np.ndarray:
+    """
+    Bucket compound scores with label_sentiment's thresholds:
+    0=negative, 1=neutral, 2=positive.
+    """
+    c = compound.to_numpy(dtype=float)
+    return (c > -0.05).astype(np.int8) + (c >= 0.05)
+
+
+def sentiment_counts(df: pd.DataFrame) -> np.ndarray:
+    """
+    Count [negative, neutral, positive] rows, reusing `sent_code` when present.
+    """
+    codes = df["sent_code"].to_numpy() if "sent_code" in df.columns else sentiment_codes(df["compound"])
+    return np.bincount(codes, minlength=3)
+
+
 @dataclass(frozen=True)
 class SummaryMetrics:
     mention_count: int
@@ -87,11 +139,10 @@ def summarize(df: pd.DataFrame) -> SummaryMetrics:
         return SummaryMetrics(mention_count=0, avg_compound=0.0, pct_positive=0.0, pct_negative=0.0, pct_neutral=0.0)
     mention_count = int(len(df))
     avg_compound = float(df["compound"].mean()) if "compound" in df.columns else 0.0
-    labels = df["compound"].apply(label_sentiment)
-    counts = labels.value_counts(dropna=False).to_dict()
-    pct_positive = 100.0 * float(counts.get("positive", 0)) / mention_count
-    pct_negative = 100.0 * float(counts.get("negative", 0)) / mention_count
-    pct_neutral = 100.0 * float(counts.get("neutral", 0)) / mention_count
+    neg, neu, pos = sentiment_counts(df)
+    pct_positive = 100.0 * float(pos) / mention_count
+    pct_negative = 100.0 * float(neg) / mention_count
+    pct_neutral = 100.0 * float(neu) / mention_count
     return SummaryMetrics(
         mention_count=mention_count,
         avg_compound=avg_compound,
@@ -105,7 +156,7 @@ def platform_breakdown(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame(columns=["platform", "mentions", "avg_compound"])
     out = (
-        df.groupby("platform", as_index=False)
+        df.groupby("platform", as_index=False, observed=True)
         .agg(mentions=("text", "count"), avg_compound=("compound", "mean"))
         .sort_values("mentions", ascending=False)
     )
@@ -116,15 +167,36 @@ def platform_breakdown(df: pd.DataFrame) -> pd.DataFrame:
 def distribution(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame([{"sentiment": "positive", "count": 0}, {"sentiment": "neutral", "count": 0}, {"sentiment": "negative", "count": 0}])
-    labels = df["compound"].apply(label_sentiment)
-    counts = labels.value_counts().reindex(["positive", "neutral", "negative"], fill_value=0)
-    return pd.DataFrame({"sentiment": counts.index, "count": counts.values})
+    neg, neu, pos = sentiment_counts(df)
+    return pd.DataFrame({"sentiment": ["positive", "neutral", "negative"], "count": [pos, neu, neg]})
 
 
-def time_series(df: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pick n_out row indices that keep the visual
+    shape of the (x, y) line. First and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    buckets = np.array_split(np.arange(1, n - 1), n_out - 2)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i, b in enumerate(buckets):
+        nxt = buckets[i + 1] if i + 1 < len(buckets) else np.array([n - 1])
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[b] - y[a]) - (x[a] - x[b]) * (cy - y[a]))
+        a = int(b[area.argmax()])
+        idx[i + 1] = a
+    return idx
+
+
+def time_series(df: pd.DataFrame, freq: str = "D", *, max_points: int | None = 800) -> pd.DataFrame:
     """
     Sentiment over time (avg compound), if timestamps exist.
     freq: 'H', 'D', 'W'...
+    Long series are downsampled with LTTB to at most max_points rows (None disables).
     """
     if df is None or df.empty or "created_at" not in df.columns:
         return pd.DataFrame(columns=["time", "avg_compound", "mentions"])
@@ -134,19 +206,20 @@ def time_series(df: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
     d = d.set_index("created_at").sort_index()
     out = d.resample(freq).agg(avg_compound=("compound", "mean"), mentions=("text", "count")).reset_index()
     out = out.rename(columns={"created_at": "time"})
+    if max_points is not None and len(out) > max_points:
+        out = out.dropna(subset=["avg_compound"]).reset_index(drop=True)
+        x = out["time"].astype("int64").to_numpy(dtype=float)
+        y = out["avg_compound"].to_numpy(dtype=float)
+        out = out.iloc[_lttb_indices(x, y, max_points)].reset_index(drop=True)
     return out
 
 
-def topics_nmf(texts: list[str], *, n_topics: int = 6, top_words: int = 8, max_features: int = 2000) -> list[dict]:
+@lru_cache(maxsize=4)
+def _tfidf(docs: tuple[str, ...], max_features: int):
     """
-    Topic modeling using TF-IDF + NMF.
-    Returns a list of topic dicts: {topic: int, terms: [..]}.
+    TF-IDF matrix + vocabulary for a corpus. Independent of n_topics, so it is
+    cached and reused when only the topic count changes.
     """
-    docs = [clean_text(t) for t in texts if isinstance(t, str) and clean_text(t)]
-    if len(docs) < 10:
-        return []
-
-    n_topics = max(2, min(int(n_topics), 10))
     vectorizer = TfidfVectorizer(
         stop_words="english",
         max_features=max_features,
@@ -154,13 +227,26 @@ def topics_nmf(texts: list[str], *, n_topics: int = 6, top_words: int = 8, max_f
         min_df=2,
     )
     X = vectorizer.fit_transform(docs)
+    return X, vectorizer.get_feature_names_out()
+
+
+def topics_nmf(texts: list[str], *, n_topics: int = 6, top_words: int = 8, max_features: int = 2000) -> list[dict]:
+    """
+    Topic modeling using TF-IDF + NMF.
+    Returns a list of topic dicts: {topic: int, terms: [..]}.
+    """
+    docs = tuple(d for d in (clean_text(t) for t in texts if isinstance(t, str)) if d)
+    if len(docs) < 10:
+        return []
+
+    n_topics = max(2, min(int(n_topics), 10))
+    X, feature_names = _tfidf(docs, max_features)
     if X.shape[1] < 10:
         return []
 
-    model = NMF(n_components=n_topics, random_state=42, init="nndsvda", max_iter=400)
-    W = model.fit_transform(X)
+    model = NMF(n_components=n_topics, random_state=42, init="nndsvda", tol=5e-3, max_iter=150)
+    model.fit(X)
     H = model.components_
-    feature_names = vectorizer.get_feature_names_out()
 
     topics: list[dict] = []
     for i, row in enumerate(H):
@@ -173,10 +259,37 @@ def topics_nmf(texts: list[str], *, n_topics: int = 6, top_words: int = 8, max_f
     return topics
 
 
-def build_wordcloud(texts: list[str], *, width: int = 900, height: int = 450) -> WordCloud | None:
-    joined = " ".join([clean_text(t) for t in texts if isinstance(t, str) and clean_text(t)])
-    if len(joined) < 50:
+_WC_TOKEN_RE = re.compile(r"\w[\w']*")
+
+
+def _word_frequencies(docs: list[str]) -> dict[str, int]:
+    """
+    Word counts as WordCloud.process_text computes them: drop "'s", digits and
+    stopwords, then let WordCloud fold cases and merge plurals.
+    """
+    counts = Counter(tok for d in docs for tok in _WC_TOKEN_RE.findall(d))
+    words = Counter()
+    for word, n in counts.items():
+        if word.lower().endswith("'s"):
+            word = word[:-2]
+        if word and not word.isdigit() and word.lower() not in STOPWORDS:
+            words[word] += n
+    freqs, _ = process_tokens(words.elements(), normalize_plurals=True)
+    return freqs
+
+
+def build_wordcloud(
+    texts: list[str], *, width: int = 900, height: int = 450, clean: bool = True
+) -> WordCloud | None:
+    """
+    Word cloud from precomputed word frequencies.
+    Pass clean=False when texts already went through clean_text (e.g. analyze_items output).
+    """
+    docs = [t for t in ((clean_text(t) if clean else t) for t in texts if isinstance(t, str)) if t]
+    if sum(len(d) + 1 for d in docs) - 1 < 50:
+        return None
+    freqs = _word_frequencies(docs)
+    if not freqs:
         return None
     wc = WordCloud(width=width, height=height, background_color="white", collocations=False)
-    return wc.generate(joined)
-
+    return wc.generate_from_frequencies(freqs)
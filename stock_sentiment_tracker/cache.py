@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+
+
+CACHE_DIR = Path(".cache")
+
+# Seconds a raw API response stays fresh, per endpoint.
+TTL_SECONDS = {
+    "stocktwits_stream": 5 * 60,
+    "reddit_search": 10 * 60,
+    "reddit_comments": 10 * 60,
+    "youtube_search": 6 * 60 * 60,
+    "youtube_comment_threads": 60 * 60,
+    "twitter_recent": 5 * 60,
+}
+
+
+def cache_key(fn: str, ticker: str, params: dict) -> str:
+    """
+    Stable key for one API call. Never include secrets in `params`.
+    """
+    payload = json.dumps({"fn": fn, "ticker": ticker.upper(), "params": params}, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class FileCache:
+    """
+    On-disk JSON cache for one endpoint: {root}/{source}/{key}.json.
+    Entries older than `ttl_seconds` are treated as missing.
+    """
+
+    source: str
+    ttl_seconds: float
+    root: Path = CACHE_DIR
+
+    @staticmethod
+    def for_endpoint(source: str) -> "FileCache":
+        return FileCache(source=source, ttl_seconds=TTL_SECONDS[source])
+
+    def _path(self, key: str) -> Path:
+        return self.root / self.source / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        try:
+            entry = orjson.loads(self._path(key).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if time.time() - float(entry.get("ts", 0)) > self.ttl_seconds:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        _write_atomic(self._path(key), orjson.dumps({"ts": time.time(), "value": value}))
+
+
+@dataclass(frozen=True)
+class CursorStore:
+    """
+    Newest item seen per (source, ticker), for incremental fetches:
+    {root}/cursors/{source}/{TICKER}.json.
+    """
+
+    root: Path = CACHE_DIR
+
+    def _path(self, source: str, ticker: str) -> Path:
+        return self.root / "cursors" / source / f"{ticker.upper()}.json"
+
+    def get(self, source: str, ticker: str) -> str | None:
+        try:
+            return orjson.loads(self._path(source, ticker).read_bytes()).get("cursor")
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def set(self, source: str, ticker: str, cursor: str) -> None:
+        _write_atomic(self._path(source, ticker), orjson.dumps({"cursor": cursor}))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file.
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+    except OSError:
+        # Caching is best-effort (e.g. read-only filesystem).
+        pass
+
+
+def cached(cache: FileCache, key: str, fetch: Callable[[], Any], *, force_refresh: bool = False) -> Any:
+    """
+    Return the cached value for `key`, or call `fetch()` and cache its result.
+    A None result (e.g. rate limited) is returned but not cached.
+    """
+    if not force_refresh:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    value = fetch()
+    if value is not None:
+        cache.set(key, value)
+    return value
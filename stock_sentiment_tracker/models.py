@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TextItem:
     """Normalized text item from any platform."""
 
@@ -16,3 +16,17 @@ class TextItem:
     external_id: str | None = None
     extra: dict | None = None
 
+
+def items_to_columns(items: list[TextItem]) -> dict[str, list]:
+    """
+    Column-wise view of `items` (one list per field, `extra` excluded),
+    ready for pd.DataFrame without per-row tuple building.
+    """
+    return {
+        "platform": [it.platform for it in items],
+        "created_at": [it.created_at for it in items],
+        "text": [it.text for it in items],
+        "url": [it.url for it in items],
+        "author": [it.author for it in items],
+        "external_id": [it.external_id for it in items],
+    }
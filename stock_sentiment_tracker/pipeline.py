@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from stock_sentiment_tracker.config import APIKeys
 from stock_sentiment_tracker.models import TextItem
 from stock_sentiment_tracker.sources.finnhub import FinnhubSocialSentiment, fetch_finnhub_social_sentiment
+from stock_sentiment_tracker.sources.mock import mock_items
 from stock_sentiment_tracker.sources.reddit import fetch_reddit
 from stock_sentiment_tracker.sources.stocktwits import fetch_stocktwits
 from stock_sentiment_tracker.sources.twitter_x import fetch_recent_tweets
@@ -20,10 +22,10 @@ class FetchResult:
 
 
 def _dedupe(items: list[TextItem]) -> list[TextItem]:
-    seen: set[str] = set()
+    seen: set[tuple[str, str, str, str]] = set()
     out: list[TextItem] = []
     for it in items:
-        key = f"{it.platform}|{it.external_id or ''}|{it.url or ''}|{it.text[:200]}"
+        key = (it.platform, it.external_id or "", it.url or "", it.text[:200])
         if key in seen:
             continue
         seen.add(key)
@@ -45,58 +47,101 @@ def fetch_all(
     finnhub_days: int = 7,
     enable_stocktwits: bool = True,
     enable_finnhub: bool = True,
+    force_refresh: bool = False,
+    incremental: bool = False,
 ) -> FetchResult:
+    """
+    Fetch every enabled source concurrently and merge the results.
+    incremental=True asks X, YouTube and StockTwits for items newer than the
+    previous incremental call only (Reddit search has no usable cursor).
+    """
     warnings: list[str] = []
     items: list[TextItem] = []
 
-    # Per-source limiters (keeps each API from being hammered)
-    x_limiter = RateLimiter(min_interval_seconds=1.2)
-    reddit_limiter = RateLimiter(min_interval_seconds=1.0)
-    yt_limiter = RateLimiter(min_interval_seconds=1.0)
-    st_limiter = RateLimiter(min_interval_seconds=0.7)
+    # X, Reddit, YouTube and StockTwits are paced by their shared per-host limiters
+    # (utils._HOST_LIMITS); Finnhub has none, so it keeps its own.
     fh_limiter = RateLimiter(min_interval_seconds=0.8)
 
-    x_items, x_warn = fetch_recent_tweets(
-        ticker, company_name, keys, limit=x_limit, rate_limiter=x_limiter
-    )
-    items.extend(x_items)
-    warnings.extend(x_warn)
-
-    r_items, r_warn = fetch_reddit(
-        ticker,
-        company_name,
-        keys,
-        posts_per_subreddit=reddit_posts_per_sub,
-        comments_per_post=reddit_comments_per_post,
-        rate_limiter=reddit_limiter,
-    )
-    items.extend(r_items)
-    warnings.extend(r_warn)
-
-    y_items, y_warn = fetch_youtube_comments(
-        ticker,
-        company_name,
-        keys,
-        videos=youtube_videos,
-        comments_per_video=youtube_comments_per_video,
-        rate_limiter=yt_limiter,
-    )
-    items.extend(y_items)
-    warnings.extend(y_warn)
-
-    if enable_stocktwits:
-        s_items, s_warn = fetch_stocktwits(
-            ticker, keys, limit=stocktwits_limit, rate_limiter=st_limiter
+    # Sources are independent and network-bound, so fetch them concurrently.
+    # Results are still merged in a fixed order to keep output deterministic.
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [
+            (
+                "X",
+                pool.submit(
+                    fetch_recent_tweets,
+                    ticker,
+                    company_name,
+                    keys,
+                    limit=x_limit,
+                    force_refresh=force_refresh,
+                    incremental=incremental,
+                ),
+            ),
+            (
+                "Reddit",
+                pool.submit(
+                    fetch_reddit,
+                    ticker,
+                    company_name,
+                    keys,
+                    posts_per_subreddit=reddit_posts_per_sub,
+                    comments_per_post=reddit_comments_per_post,
+                    force_refresh=force_refresh,
+                ),
+            ),
+            (
+                "YouTube",
+                pool.submit(
+                    fetch_youtube_comments,
+                    ticker,
+                    company_name,
+                    keys,
+                    videos=youtube_videos,
+                    comments_per_video=youtube_comments_per_video,
+                    force_refresh=force_refresh,
+                    incremental=incremental,
+                ),
+            ),
+        ]
+        if enable_stocktwits:
+            futures.append(
+                (
+                    "StockTwits",
+                    pool.submit(
+                        fetch_stocktwits,
+                        ticker,
+                        keys,
+                        limit=stocktwits_limit,
+                        force_refresh=force_refresh,
+                        incremental=incremental,
+                    ),
+                )
+            )
+        fh_future = (
+            pool.submit(fetch_finnhub_social_sentiment, ticker, keys, days=finnhub_days, rate_limiter=fh_limiter)
+            if enable_finnhub
+            else None
         )
-        items.extend(s_items)
-        warnings.extend(s_warn)
 
-    finnhub: FinnhubSocialSentiment | None = None
-    if enable_finnhub:
-        finnhub, fh_warn = fetch_finnhub_social_sentiment(
-            ticker, keys, days=finnhub_days, rate_limiter=fh_limiter
-        )
-        warnings.extend(fh_warn)
+        for platform, fut in futures:
+            try:
+                src_items, src_warn = fut.result()
+            except Exception as e:
+                # Fetchers handle API errors themselves; this only guards against bugs,
+                # so one crashing source cannot take the others' results down with it.
+                src_items = mock_items(platform, ticker)
+                src_warn = [f"{platform} fetch crashed ({type(e).__name__}); using mock {platform} data."]
+            items.extend(src_items)
+            warnings.extend(src_warn)
+
+        finnhub: FinnhubSocialSentiment | None = None
+        if fh_future is not None:
+            try:
+                finnhub, fh_warn = fh_future.result()
+            except Exception as e:
+                fh_warn = [f"Finnhub fetch crashed ({type(e).__name__}); skipping Finnhub aggregated sentiment."]
+            warnings.extend(fh_warn)
 
     items = _dedupe(items)
     return FetchResult(items=items, warnings=warnings, finnhub=finnhub)
@@ -3,10 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, timedelta
 
-import requests
+import orjson
 
 from stock_sentiment_tracker.config import APIKeys
-from stock_sentiment_tracker.utils import RateLimiter
+from stock_sentiment_tracker.utils import RateLimiter, http_session
 
 
 @dataclass(frozen=True)
@@ -51,41 +51,23 @@ def fetch_finnhub_social_sentiment(
     }
 
     try:
-        r = requests.get(url, params=params, timeout=20)
+        r = http_session().get(url, params=params, timeout=20)
         if r.status_code == 429:
             warnings.append("Finnhub rate limit hit; skipping Finnhub aggregated sentiment.")
             return None, warnings
         r.raise_for_status()
-        data = r.json() or {}
-        reddit = (data.get("reddit") or [])[-1:]  # last datapoint
-        twitter = (data.get("twitter") or [])[-1:]
-
-        def _sum_field(rows: list[dict], field: str) -> float:
-            total = 0.0
-            for row in rows:
-                try:
-                    total += float(row.get(field) or 0.0)
-                except Exception:
-                    continue
-            return total
-
-        def _sum_int(rows: list[dict], field: str) -> int:
-            total = 0
-            for row in rows:
-                try:
-                    total += int(row.get(field) or 0)
-                except Exception:
-                    continue
-            return total
+        data = orjson.loads(r.content) or {}
+        reddit = (data.get("reddit") or [{}])[-1]  # last datapoint
+        twitter = (data.get("twitter") or [{}])[-1]
 
         fh = FinnhubSocialSentiment(
             symbol=ticker.upper(),
-            reddit_mentions=_sum_int(reddit, "mention"),
-            reddit_positive_score=_sum_field(reddit, "positiveScore"),
-            reddit_negative_score=_sum_field(reddit, "negativeScore"),
-            twitter_mentions=_sum_int(twitter, "mention"),
-            twitter_positive_score=_sum_field(twitter, "positiveScore"),
-            twitter_negative_score=_sum_field(twitter, "negativeScore"),
+            reddit_mentions=int(reddit.get("mention") or 0),
+            reddit_positive_score=float(reddit.get("positiveScore") or 0.0),
+            reddit_negative_score=float(reddit.get("negativeScore") or 0.0),
+            twitter_mentions=int(twitter.get("mention") or 0),
+            twitter_positive_score=float(twitter.get("positiveScore") or 0.0),
+            twitter_negative_score=float(twitter.get("negativeScore") or 0.0),
         )
         return fh, warnings
     except Exception as e:
@@ -1,25 +1,70 @@
 from __future__ import annotations
 
-import praw
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import orjson
+import requests
+
+from stock_sentiment_tracker.cache import FileCache, cache_key, cached
 from stock_sentiment_tracker.config import APIKeys
 from stock_sentiment_tracker.models import TextItem
 from stock_sentiment_tracker.sources.mock import mock_items
-from stock_sentiment_tracker.utils import RateLimiter, clean_text, utc_from_epoch
+from stock_sentiment_tracker.utils import (
+    RateLimiter,
+    clean_text,
+    clean_text_batch,
+    first_seen,
+    host_limiter,
+    http_session,
+    utc_from_epoch,
+)
 
 
 DEFAULT_SUBREDDITS = ["stocks", "investing", "wallstreetbets"]
 
+_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+_API_BASE = "https://oauth.reddit.com"
+# Upper bound on in-flight Reddit requests (subreddit searches + comment fetches).
+_MAX_WORKERS = 8
+
+
+_token_lock = threading.Lock()
+# (client_id, client_secret) -> (access_token, expires_at)
+_tokens: dict[tuple[str, str], tuple[str, float]] = {}
+
 
-def _build_reddit(keys: APIKeys) -> praw.Reddit | None:
-    if keys.reddit_client_id and keys.reddit_client_secret and keys.reddit_user_agent:
-        return praw.Reddit(
-            client_id=keys.reddit_client_id,
-            client_secret=keys.reddit_client_secret,
-            user_agent=keys.reddit_user_agent,
-            check_for_async=False,
+def _get_token(keys: APIKeys) -> str | None:
+    """
+    App-only OAuth token (client credentials grant); read-only access is all we need.
+    Tokens are reused across calls until shortly before they expire.
+    """
+    if not (keys.reddit_client_id and keys.reddit_client_secret and keys.reddit_user_agent):
+        return None
+    cred = (keys.reddit_client_id, keys.reddit_client_secret)
+    with _token_lock:
+        token, expires_at = _tokens.get(cred, ("", 0.0))
+        if token and time.time() < expires_at:
+            return token
+        r = http_session().post(
+            _TOKEN_URL,
+            auth=cred,
+            data={"grant_type": "client_credentials"},
+            headers={"User-Agent": keys.reddit_user_agent},
+            timeout=20,
         )
-    return None
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+        # Refresh a minute early so in-flight requests never carry an expired token.
+        _tokens[cred] = (data["access_token"], time.time() + float(data.get("expires_in", 3600)) - 60)
+        return data["access_token"]
+
+
+def _reddit_get(path: str, params: dict, headers: dict) -> object:
+    r = http_session().get(f"{_API_BASE}{path}", params={**params, "raw_json": 1}, headers=headers, timeout=20)
+    r.raise_for_status()
+    return orjson.loads(r.content)
 
 
 def fetch_reddit(
@@ -31,14 +76,19 @@ def fetch_reddit(
     posts_per_subreddit: int = 30,
     comments_per_post: int = 10,
     rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    dedupe: bool = True,
 ) -> tuple[list[TextItem], list[str]]:
     """
     Search a few finance subreddits for ticker/company and pull top-level comments.
+    Subreddit searches and per-post comment fetches run concurrently, and
+    responses are served from the on-disk cache while fresh unless force_refresh.
+    With dedupe, a post surfaced by several subreddits is fetched once and
+    repeated texts are dropped.
     Returns (items, warnings).
     """
     warnings: list[str] = []
-    reddit = _build_reddit(keys)
-    if reddit is None:
+    if not (keys.reddit_client_id and keys.reddit_client_secret and keys.reddit_user_agent):
         warnings.append("Reddit keys not configured; using mock Reddit data.")
         return mock_items("Reddit", ticker), warnings
 
@@ -49,70 +99,113 @@ def fetch_reddit(
     query = " OR ".join(f'"{p}"' for p in query_parts)
 
     items: list[TextItem] = []
-    limiter = rate_limiter or RateLimiter(min_interval_seconds=1.0)
+    errors: list[Exception] = []
+    seen_posts: set[str] = set()
+    seen_texts: set[bytes] = set()
+    # Pacing comes from the shared per-host limiter; rate_limiter only adds to it.
+    limiter = rate_limiter
 
     try:
-        for sub in subs:
-            limiter.wait()
-            subreddit = reddit.subreddit(sub)
-
-            # PRAW's search uses Reddit listing; limit is approximate.
-            for submission in subreddit.search(query, sort="hot", time_filter="week", limit=posts_per_subreddit):
-                title = clean_text(submission.title or "")
-                body = clean_text(submission.selftext or "")
-                combined = (title + "\n" + body).strip()
-                created_at = utc_from_epoch(getattr(submission, "created_utc", 0) or 0)
-                url = getattr(submission, "url", None) or f"https://www.reddit.com{submission.permalink}"
+        headers = {"Authorization": f"bearer {_get_token(keys)}", "User-Agent": keys.reddit_user_agent}
+
+        search_cache = FileCache.for_endpoint("reddit_search")
+        comments_cache = FileCache.for_endpoint("reddit_comments")
+
+        def _get(path: str, params: dict) -> object:
+            if limiter is not None:
+                limiter.wait()
+            with host_limiter("oauth.reddit.com"):
+                return _reddit_get(path, params, headers)
+
+        def _search(sub: str) -> list[dict]:
+            path = f"/r/{sub}/search"
+            params = {"q": query, "restrict_sr": 1, "sort": "hot", "t": "week", "limit": posts_per_subreddit}
+            listing = cached(
+                search_cache, cache_key(path, ticker, params), lambda: _get(path, params), force_refresh=force_refresh
+            )
+            return [c["data"] for c in listing["data"]["children"] if c.get("kind") == "t3"]
+
+        def _comments(post_id: str) -> list[dict]:
+            path = f"/comments/{post_id}"
+            # Top-level comments only, best first; one call returns them inline (no "more" expansion).
+            params = {"limit": comments_per_post, "depth": 1, "sort": "top"}
+            _, listing = cached(
+                comments_cache, cache_key(path, ticker, params), lambda: _get(path, params), force_refresh=force_refresh
+            )
+            return [c["data"] for c in listing["data"]["children"] if c.get("kind") == "t1"]
+
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+            searches = [(sub, pool.submit(_search, sub)) for sub in subs]
+            # Queue each post's comment fetch as soon as its subreddit listing arrives.
+            posts: list[tuple[str, dict, Future | None]] = []
+            for sub, fut in searches:
+                try:
+                    listing = fut.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                for post in listing:
+                    if dedupe:
+                        if post["id"] in seen_posts:
+                            continue
+                        seen_posts.add(post["id"])
+                    cfut = pool.submit(_comments, post["id"]) if comments_per_post > 0 else None
+                    posts.append((sub, post, cfut))
 
-                if combined:
+            for sub, post, cfut in posts:
+                title = clean_text(post.get("title") or "")
+                body = clean_text(post.get("selftext") or "")
+                combined = (title + "\n" + body).strip()
+                if combined and (not dedupe or first_seen(seen_texts, combined)):
                     items.append(
                         TextItem(
                             platform="Reddit",
                             text=combined,
-                            created_at=created_at,
-                            url=url,
-                            author=str(getattr(submission, "author", "") or ""),
-                            external_id=str(submission.id),
+                            created_at=utc_from_epoch(post.get("created_utc") or 0),
+                            url=post.get("url") or f"https://www.reddit.com{post.get('permalink', '')}",
+                            author=str(post.get("author") or ""),
+                            external_id=str(post["id"]),
                             extra={"subreddit": sub, "kind": "post"},
                         )
                     )
 
-                # Comments
-                limiter.wait()
+                if cfut is None:
+                    continue
                 try:
-                    submission.comments.replace_more(limit=0)
-                    count = 0
-                    for c in submission.comments.list():
-                        if count >= comments_per_post:
-                            break
-                        txt = clean_text(getattr(c, "body", "") or "")
-                        if not txt:
-                            continue
-                        c_created = utc_from_epoch(getattr(c, "created_utc", 0) or 0)
-                        items.append(
-                            TextItem(
-                                platform="Reddit",
-                                text=txt,
-                                created_at=c_created,
-                                url=f"https://www.reddit.com{c.permalink}",
-                                author=str(getattr(c, "author", "") or ""),
-                                external_id=str(getattr(c, "id", "") or ""),
-                                extra={"subreddit": sub, "kind": "comment", "post_id": submission.id},
-                            )
-                        )
-                        count += 1
+                    comments = cfut.result()
                 except Exception:
                     # Comments may fail on some locked/deleted threads; keep going.
                     continue
-
-    except praw.exceptions.APIException:
-        warnings.append("Reddit API error/rate limit hit; using mock Reddit data.")
-        if not items:
-            return mock_items("Reddit", ticker), warnings
+                count = 0
+                for c, txt in zip(comments, clean_text_batch(cm.get("body") for cm in comments)):
+                    if count >= comments_per_post:
+                        break
+                    if not txt:
+                        continue
+                    if dedupe and not first_seen(seen_texts, txt):
+                        continue
+                    items.append(
+                        TextItem(
+                            platform="Reddit",
+                            text=txt,
+                            created_at=utc_from_epoch(c.get("created_utc") or 0),
+                            url=f"https://www.reddit.com{c.get('permalink', '')}",
+                            author=str(c.get("author") or ""),
+                            external_id=str(c.get("id") or ""),
+                            extra={"subreddit": sub, "kind": "comment", "post_id": post["id"]},
+                        )
+                    )
+                    count += 1
     except Exception as e:
-        warnings.append(f"Reddit fetch failed ({type(e).__name__}); using mock Reddit data.")
+        errors.append(e)
+
+    if errors:
+        e = errors[0]
+        if isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code == 429:
+            warnings.append("Reddit API error/rate limit hit; using mock Reddit data.")
+        else:
+            warnings.append(f"Reddit fetch failed ({type(e).__name__}); using mock Reddit data.")
         if not items:
             return mock_items("Reddit", ticker), warnings
 
     return items, warnings
-
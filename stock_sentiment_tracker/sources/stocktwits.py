@@ -1,25 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+import orjson
 
+from stock_sentiment_tracker.cache import CursorStore, FileCache, cache_key, cached
 from stock_sentiment_tracker.config import APIKeys
 from stock_sentiment_tracker.models import TextItem
 from stock_sentiment_tracker.sources.mock import mock_items
-from stock_sentiment_tracker.utils import RateLimiter, clean_text
-
-
-def _parse_iso(ts: str | None) -> datetime | None:
-    if not ts:
-        return None
-    try:
-        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except Exception:
-        return None
+from stock_sentiment_tracker.utils import RateLimiter, clean_text, first_seen, host_limiter, http_session, parse_iso
 
 
 def fetch_stocktwits(
@@ -28,35 +17,59 @@ def fetch_stocktwits(
     *,
     limit: int = 80,
     rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    incremental: bool = False,
+    dedupe: bool = True,
 ) -> tuple[list[TextItem], list[str]]:
     """
     Fetch StockTwits symbol stream messages.
 
     Many StockTwits endpoints allow unauthenticated reads. If you have a token,
     provide STOCKTWITS_TOKEN to increase reliability.
+    Responses are served from the on-disk cache while fresh unless force_refresh.
+    With incremental=True only messages newer than the last incremental call are fetched.
+    With dedupe, repeated message texts are dropped.
     """
     warnings: list[str] = []
-    limiter = rate_limiter or RateLimiter(min_interval_seconds=0.7)
+    # Pacing comes from the shared per-host limiter; rate_limiter only adds to it.
+    limiter = rate_limiter
 
     url = f"https://api.stocktwits.com/api/2/streams/symbol/{ticker.upper()}.json"
     params = {}
     if keys.stocktwits_token:
         params["access_token"] = keys.stocktwits_token
+    cursors = CursorStore()
+    since = cursors.get("stocktwits", ticker) if incremental else None
+    if since:
+        params["since"] = since
+
+    def _fetch() -> dict | None:
+        if limiter is not None:
+            limiter.wait()
+        with host_limiter("api.stocktwits.com"):
+            r = http_session().get(url, params=params, timeout=20)
+        if r.status_code == 429:
+            return None
+        r.raise_for_status()
+        return orjson.loads(r.content) or {}
 
     items: list[TextItem] = []
+    seen: set[bytes] = set()
     try:
-        limiter.wait()
-        r = requests.get(url, params=params, timeout=20)
-        if r.status_code == 429:
+        data = cached(
+            FileCache.for_endpoint("stocktwits_stream"),
+            cache_key("streams/symbol", ticker, {"since": since}),
+            _fetch,
+            force_refresh=force_refresh,
+        )
+        if data is None:
             warnings.append("StockTwits rate limit hit; using mock StockTwits data.")
             return mock_items("StockTwits", ticker), warnings
-        r.raise_for_status()
-        data = r.json() or {}
         for msg in (data.get("messages") or [])[:limit]:
             body = clean_text((msg.get("body") or "")[:5000])
-            if not body:
+            if not body or (dedupe and not first_seen(seen, body)):
                 continue
-            created_at = _parse_iso(msg.get("created_at"))
+            created_at = parse_iso(msg.get("created_at"))
             user = (msg.get("user") or {}).get("username")
             mid = msg.get("id")
             items.append(
@@ -70,6 +83,8 @@ def fetch_stocktwits(
                     extra={"symbol": ticker.upper()},
                 )
             )
+        if incremental and (ids := [int(it.external_id) for it in items if it.external_id]):
+            cursors.set("stocktwits", ticker, str(max(ids)))
     except Exception as e:
         warnings.append(f"StockTwits fetch failed ({type(e).__name__}); using mock StockTwits data.")
         if not items:
@@ -77,3 +92,36 @@ def fetch_stocktwits(
 
     return items, warnings
 
+
+def fetch_stocktwits_multi(
+    tickers: list[str],
+    keys: APIKeys,
+    *,
+    limit: int = 80,
+    rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    incremental: bool = False,
+    dedupe: bool = True,
+    max_workers: int = 4,
+) -> dict[str, tuple[list[TextItem], list[str]]]:
+    """
+    fetch_stocktwits for several tickers. The symbol stream takes one symbol per
+    call, so calls run concurrently over the shared keep-alive session and are
+    paced by the api.stocktwits.com host limiter. Returns {ticker: (items, warnings)}.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            t: pool.submit(
+                fetch_stocktwits,
+                t,
+                keys,
+                limit=limit,
+                rate_limiter=rate_limiter,
+                force_refresh=force_refresh,
+                incremental=incremental,
+                dedupe=dedupe,
+            )
+            for t in tickers
+        }
+        return {t: fut.result() for t, fut in futures.items()}
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from datetime import timezone
+import re
+from functools import lru_cache
 
+import orjson
+import requests
 import tweepy
 
+from stock_sentiment_tracker.cache import CursorStore, FileCache, cache_key, cached
 from stock_sentiment_tracker.config import APIKeys
 from stock_sentiment_tracker.models import TextItem
 from stock_sentiment_tracker.sources.mock import mock_items
-from stock_sentiment_tracker.utils import RateLimiter, clean_text
+from stock_sentiment_tracker.utils import RateLimiter, clean_text, first_seen, host_limiter, parse_iso
 
 
 def _build_client(keys: APIKeys) -> tweepy.Client | None:
@@ -19,7 +23,7 @@ def _build_client(keys: APIKeys) -> tweepy.Client | None:
     - OAuth1 keys (consumer + access tokens)
     """
     if keys.twitter_bearer_token:
-        return tweepy.Client(bearer_token=keys.twitter_bearer_token, wait_on_rate_limit=False)
+        return _client(keys.twitter_bearer_token, None, None, None, None)
 
     if (
         keys.twitter_consumer_key
@@ -27,16 +31,126 @@ def _build_client(keys: APIKeys) -> tweepy.Client | None:
         and keys.twitter_access_token
         and keys.twitter_access_token_secret
     ):
-        return tweepy.Client(
-            consumer_key=keys.twitter_consumer_key,
-            consumer_secret=keys.twitter_consumer_secret,
-            access_token=keys.twitter_access_token,
-            access_token_secret=keys.twitter_access_token_secret,
-            wait_on_rate_limit=False,
+        return _client(
+            None,
+            keys.twitter_consumer_key,
+            keys.twitter_consumer_secret,
+            keys.twitter_access_token,
+            keys.twitter_access_token_secret,
         )
     return None
 
 
+@lru_cache(maxsize=4)
+def _client(
+    bearer_token: str | None,
+    consumer_key: str | None,
+    consumer_secret: str | None,
+    access_token: str | None,
+    access_token_secret: str | None,
+) -> tweepy.Client:
+    """
+    One client per credential set, so its requests session (and the pooled
+    TLS connection) is reused across fetches instead of rebuilt each call.
+    Responses come back raw (requests.Response); callers parse them with orjson
+    into plain JSON dicts, which can also be cached on disk.
+    """
+    return tweepy.Client(
+        bearer_token=bearer_token,
+        consumer_key=consumer_key,
+        consumer_secret=consumer_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+        return_type=requests.Response,
+        wait_on_rate_limit=False,
+    )
+
+
+# Recent search rejects queries longer than this (Basic/Essential access).
+_MAX_QUERY_LEN = 512
+_CASHTAG_RE = re.compile(r"\$([A-Za-z0-9.\-]+)")
+
+
+@lru_cache(maxsize=1024)
+def _build_query(ticker: str, company_name: str | None) -> str:
+    cashtag = f"${ticker.upper()}"
+    query_parts = [f'("{cashtag}")']
+    if company_name and company_name.strip():
+        query_parts.append(f'"{company_name.strip()}"')
+    return " OR ".join(query_parts) + " -is:retweet lang:en"
+
+
+def _collect_tweets(
+    client: tweepy.Client,
+    query: str,
+    cache_ticker: str,
+    *,
+    limit: int,
+    limiter: RateLimiter | None,
+    force_refresh: bool,
+    since_id: str | None = None,
+    dedupe: bool = True,
+    out: list[TextItem],
+) -> None:
+    """
+    Page through recent search for `query`, appending up to `limit` items to `out`.
+    Appends in place so callers keep partial results when a page raises.
+    """
+    recent_cache = FileCache.for_endpoint("twitter_recent")
+    seen: set[bytes] = set()
+    next_token: str | None = None
+    start = len(out)
+
+    def _search(params: dict) -> dict:
+        if limiter is not None:
+            limiter.wait()
+        with host_limiter("api.twitter.com"):
+            return orjson.loads(client.search_recent_tweets(**params).content)
+
+    # Twitter recent search max_results is 10..100 per request; paginate.
+    while len(out) - start < limit:
+        remaining = limit - (len(out) - start)
+        max_results = 100 if remaining >= 100 else max(10, remaining)
+        params = {
+            "query": query,
+            "max_results": max_results,
+            "next_token": next_token,
+            "tweet_fields": ["created_at", "lang"],
+        }
+        if since_id:
+            params["since_id"] = since_id
+        resp = cached(
+            recent_cache,
+            cache_key("search_recent_tweets", cache_ticker, params),
+            lambda: _search(params),
+            force_refresh=force_refresh,
+        )
+
+        if not resp or not resp.get("data"):
+            break
+
+        for tw in resp["data"]:
+            txt = clean_text(tw.get("text") or "")
+            if not txt or (dedupe and not first_seen(seen, txt)):
+                continue
+            out.append(
+                TextItem(
+                    platform="X",
+                    text=txt,
+                    created_at=parse_iso(tw.get("created_at")),
+                    url=f"https://x.com/i/web/status/{tw['id']}",
+                    author=None,
+                    external_id=str(tw["id"]),
+                    extra={"query": query},
+                )
+            )
+
+        meta = resp.get("meta") or {}
+        next_token = meta.get("next_token")
+        if not next_token:
+            break
+
+
 def fetch_recent_tweets(
     ticker: str,
     company_name: str | None,
@@ -44,9 +158,15 @@ def fetch_recent_tweets(
     *,
     limit: int = 150,
     rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    incremental: bool = False,
+    dedupe: bool = True,
 ) -> tuple[list[TextItem], list[str]]:
     """
     Search recent tweets containing $TICKER or company name.
+    Responses are served from the on-disk cache while fresh unless force_refresh.
+    With incremental=True only tweets newer than the last incremental call are fetched.
+    With dedupe, repeated tweet texts (copy-paste spam, quote chains) are dropped.
     Returns (items, warnings).
     """
     warnings: list[str] = []
@@ -55,55 +175,23 @@ def fetch_recent_tweets(
         warnings.append("X (Twitter) keys not configured; using mock X data.")
         return mock_items("X", ticker), warnings
 
-    # Twitter recent search max_results is 10..100 per request; paginate.
-    cashtag = f"${ticker.upper()}"
-    query_parts = [f'("{cashtag}")']
-    if company_name and company_name.strip():
-        query_parts.append(f'"{company_name.strip()}"')
-    query = " OR ".join(query_parts) + " -is:retweet lang:en"
-
     items: list[TextItem] = []
-    next_token: str | None = None
-    limiter = rate_limiter or RateLimiter(min_interval_seconds=1.2)
+    cursors = CursorStore()
 
     try:
-        while len(items) < limit:
-            limiter.wait()
-            remaining = limit - len(items)
-            max_results = 100 if remaining >= 100 else max(10, remaining)
-            resp = client.search_recent_tweets(
-                query=query,
-                max_results=max_results,
-                next_token=next_token,
-                tweet_fields=["created_at", "lang"],
-            )
-
-            if resp is None or resp.data is None:
-                break
-
-            for tw in resp.data:
-                txt = clean_text(getattr(tw, "text", "") or "")
-                if not txt:
-                    continue
-                created_at = getattr(tw, "created_at", None)
-                if created_at is not None and created_at.tzinfo is None:
-                    created_at = created_at.replace(tzinfo=timezone.utc)
-                items.append(
-                    TextItem(
-                        platform="X",
-                        text=txt,
-                        created_at=created_at,
-                        url=f"https://x.com/i/web/status/{tw.id}",
-                        author=None,
-                        external_id=str(tw.id),
-                        extra={"query": query},
-                    )
-                )
-
-            meta = getattr(resp, "meta", None) or {}
-            next_token = meta.get("next_token")
-            if not next_token:
-                break
+        _collect_tweets(
+            client,
+            _build_query(ticker, company_name),
+            ticker,
+            limit=limit,
+            limiter=rate_limiter,
+            force_refresh=force_refresh,
+            since_id=cursors.get("twitter", ticker) if incremental else None,
+            dedupe=dedupe,
+            out=items,
+        )
+        if incremental and items:
+            cursors.set("twitter", ticker, str(max(int(it.external_id) for it in items)))
 
     except tweepy.TooManyRequests:
         warnings.append("X rate limit hit; using mock X data for remaining results.")
@@ -116,3 +204,83 @@ def fetch_recent_tweets(
 
     return items, warnings
 
+
+def _multi_query(tickers: list[str]) -> str:
+    return " OR ".join(f'("${t}")' for t in tickers) + " -is:retweet lang:en"
+
+
+def _ticker_groups(tickers: list[str]) -> list[list[str]]:
+    """
+    Split tickers into groups whose OR-ed cashtag query fits the recent-search query limit.
+    """
+    groups: list[list[str]] = []
+    for t in tickers:
+        if groups and len(_multi_query(groups[-1] + [t])) <= _MAX_QUERY_LEN:
+            groups[-1].append(t)
+        else:
+            groups.append([t])
+    return groups
+
+
+def fetch_recent_tweets_multi(
+    tickers: list[str],
+    keys: APIKeys,
+    *,
+    limit: int = 150,
+    rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    incremental: bool = False,
+    dedupe: bool = True,
+) -> dict[str, tuple[list[TextItem], list[str]]]:
+    """
+    Recent tweets for several tickers with one OR-ed cashtag search per group of
+    tickers instead of one search each. `limit` is per ticker. Each tweet is
+    assigned to every requested ticker whose cashtag it contains.
+    With incremental=True each group searches from its oldest member cursor and
+    each ticker only keeps tweets newer than its own; cursors are shared with
+    fetch_recent_tweets.
+    Returns {ticker: (items, warnings)}, like fetch_recent_tweets per ticker.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+    client = _build_client(keys)
+    if client is None:
+        msg = "X (Twitter) keys not configured; using mock X data."
+        return {t: (mock_items("X", t), [msg]) for t in tickers}
+
+    cursors = CursorStore()
+    results: dict[str, tuple[list[TextItem], list[str]]] = {}
+    for group in _ticker_groups(tickers):
+        fetched: list[TextItem] = []
+        warning: str | None = None
+        since = {t: cursors.get("twitter", t) if incremental else None for t in group}
+        # A ticker without a cursor needs the full window, so the group does too.
+        since_id = None if None in since.values() else min(since.values(), key=int)
+        try:
+            _collect_tweets(
+                client,
+                _multi_query(group),
+                ",".join(group),
+                limit=limit * len(group),
+                limiter=rate_limiter,
+                force_refresh=force_refresh,
+                since_id=since_id,
+                dedupe=dedupe,
+                out=fetched,
+            )
+        except tweepy.TooManyRequests:
+            warning = "X rate limit hit; using mock X data for remaining results."
+        except Exception as e:
+            warning = f"X fetch failed ({type(e).__name__}); using mock X data."
+
+        wanted = set(group)
+        by_ticker: dict[str, list[TextItem]] = {t: [] for t in group}
+        for it in fetched:
+            for tag in {m.rstrip(".-").upper() for m in _CASHTAG_RE.findall(it.text)} & wanted:
+                if len(by_ticker[tag]) < limit and (since[tag] is None or int(it.external_id) > int(since[tag])):
+                    by_ticker[tag].append(it)
+        for t, found in by_ticker.items():
+            if incremental and found and not warning:
+                cursors.set("twitter", t, str(max(int(it.external_id) for it in found)))
+            warns = [warning] if warning else []
+            results[t] = (found if found or not warning else mock_items("X", t), warns)
+    return results
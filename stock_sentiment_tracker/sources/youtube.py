@@ -1,28 +1,60 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+import orjson
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
 
+from stock_sentiment_tracker.cache import CursorStore, FileCache, cache_key, cached
 from stock_sentiment_tracker.config import APIKeys
 from stock_sentiment_tracker.models import TextItem
 from stock_sentiment_tracker.sources.mock import mock_items
-from stock_sentiment_tracker.utils import RateLimiter, clean_text
+from stock_sentiment_tracker.utils import RateLimiter, clean_text_batch, first_seen, host_limiter, parse_iso
 
 
-def _parse_rfc3339(ts: str | None) -> datetime | None:
-    if not ts:
-        return None
-    try:
-        # Example: 2024-01-01T12:34:56Z
-        if ts.endswith("Z"):
-            ts = ts.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(ts)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except Exception:
-        return None
+# Upper bound on concurrent commentThreads requests.
+_MAX_WORKERS = 8
+
+_local = threading.local()
+
+
+def _thread_http():
+    """
+    httplib2 connections are not thread-safe, so each worker thread gets its own.
+    """
+    http = getattr(_local, "http", None)
+    if http is None:
+        http = _local.http = build_http()
+    return http
+
+
+class _OrjsonModel(JsonModel):
+    """
+    JsonModel that parses response bodies with orjson instead of the stdlib json.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+@lru_cache(maxsize=4)
+def _yt_service(api_key: str):
+    """
+    Build the client once per key, from the discovery doc bundled with the library.
+    """
+    return build(
+        "youtube", "v3", developerKey=api_key, model=_OrjsonModel(), static_discovery=True, cache_discovery=False
+    )
 
 
 def fetch_youtube_comments(
@@ -33,9 +65,16 @@ def fetch_youtube_comments(
     videos: int = 7,
     comments_per_video: int = 50,
     rate_limiter: RateLimiter | None = None,
+    force_refresh: bool = False,
+    incremental: bool = False,
+    dedupe: bool = True,
 ) -> tuple[list[TextItem], list[str]]:
     """
     Search videos mentioning the ticker/company and fetch top comments.
+    Responses are served from the on-disk cache while fresh unless force_refresh.
+    With incremental=True only comments newer than the last incremental call are kept.
+    With dedupe, repeated comment texts are dropped as they are read, so which video
+    keeps a duplicate depends on which page arrives first.
     Returns (items, warnings).
     """
     warnings: list[str] = []
@@ -43,70 +82,121 @@ def fetch_youtube_comments(
         warnings.append("YouTube API key not configured; using mock YouTube data.")
         return mock_items("YouTube", ticker), warnings
 
-    limiter = rate_limiter or RateLimiter(min_interval_seconds=1.0)
+    # Pacing comes from the shared per-host limiter; rate_limiter only adds to it.
+    limiter = rate_limiter
     items: list[TextItem] = []
+    errors: list[Exception] = []
 
     q = f"{ticker.upper()} stock analysis"
     if company_name and company_name.strip():
         q = f"{ticker.upper()} {company_name.strip()} stock analysis"
 
     try:
-        yt = build("youtube", "v3", developerKey=keys.youtube_api_key)
+        yt = _yt_service(keys.youtube_api_key)
 
-        limiter.wait()
-        search_resp = (
-            yt.search()
-            .list(part="id,snippet", q=q, type="video", maxResults=max(1, min(10, videos)))
-            .execute()
-        )
-        video_ids: list[str] = []
-        for it in search_resp.get("items", []):
-            vid = (it.get("id") or {}).get("videoId")
-            if vid:
-                video_ids.append(vid)
+        search_cache = FileCache.for_endpoint("youtube_search")
+        threads_cache = FileCache.for_endpoint("youtube_comment_threads")
+        cursors = CursorStore()
+        since = parse_iso(cursors.get("youtube", ticker)) if incremental else None
+        # Shared by the worker threads so duplicates are dropped before a TextItem is built.
+        seen: set[bytes] = set()
+        seen_lock = threading.Lock()
 
-        for vid in video_ids[:videos]:
-            fetched = 0
-            page_token: str | None = None
-            while fetched < comments_per_video:
+        def _execute(req):
+            if limiter is not None:
                 limiter.wait()
-                req = yt.commentThreads().list(
-                    part="snippet",
-                    videoId=vid,
-                    maxResults=min(100, comments_per_video - fetched),
-                    pageToken=page_token,
-                    textFormat="plainText",
-                )
-                resp = req.execute()
-                for th in resp.get("items", []):
-                    top = ((th.get("snippet") or {}).get("topLevelComment") or {}).get("snippet") or {}
-                    txt = clean_text(top.get("textDisplay", "") or "")
+            with host_limiter("youtube.googleapis.com"):
+                return req.execute(http=_thread_http())
+
+        def _video_comments(vid: str) -> list[TextItem]:
+            out: list[TextItem] = []
+            page_token: str | None = None
+            while len(out) < comments_per_video:
+                # Always ask for a full page: quota is billed per request, and blank
+                # comments are dropped, so a short page often forces a second call.
+                params = {
+                    "part": "snippet",
+                    "videoId": vid,
+                    "maxResults": 100,
+                    "pageToken": page_token,
+                    "textFormat": "plainText",
+                }
+                if incremental:
+                    # Newest first, so the cursor check below can stop early.
+                    params["order"] = "time"
+                if incremental:
+                    # Always hit the API: a cached page (kept up to an hour) would hide
+                    # comments posted since, and the cursor cut-off would drop the rest.
+                    resp = _execute(yt.commentThreads().list(**params))
+                else:
+                    resp = cached(
+                        threads_cache,
+                        cache_key("commentThreads.list", ticker, params),
+                        lambda: _execute(yt.commentThreads().list(**params)),
+                        force_refresh=force_refresh,
+                    )
+                threads = resp.get("items", [])
+                tops = [((th.get("snippet") or {}).get("topLevelComment") or {}).get("snippet") or {} for th in threads]
+                texts = clean_text_batch(top.get("textDisplay") for top in tops)
+                for th, top, txt in zip(threads, tops, texts):
+                    published = parse_iso(top.get("publishedAt"))
+                    if since is not None and published is not None and published <= since:
+                        # Incremental requests use order=time, so the rest are older too.
+                        return out
                     if not txt:
                         continue
-                    published = _parse_rfc3339(top.get("publishedAt"))
-                    author = top.get("authorDisplayName")
-                    items.append(
+                    if dedupe:
+                        with seen_lock:
+                            if not first_seen(seen, txt):
+                                continue
+                    out.append(
                         TextItem(
                             platform="YouTube",
                             text=txt,
                             created_at=published,
                             url=f"https://www.youtube.com/watch?v={vid}",
-                            author=author,
+                            author=top.get("authorDisplayName"),
                             external_id=(th.get("id") or None),
                             extra={"video_id": vid, "query": q},
                         )
                     )
-                    fetched += 1
-                    if fetched >= comments_per_video:
+                    if len(out) >= comments_per_video:
                         break
                 page_token = resp.get("nextPageToken")
                 if not page_token:
                     break
+            return out
 
+        search_params = {"part": "id,snippet", "q": q, "type": "video", "maxResults": max(1, min(10, videos))}
+        search_resp = cached(
+            search_cache,
+            cache_key("search.list", ticker, search_params),
+            lambda: _execute(yt.search().list(**search_params)),
+            force_refresh=force_refresh,
+        )
+        video_ids: list[str] = []
+        for it in search_resp.get("items", []):
+            vid = (it.get("id") or {}).get("videoId")
+            if vid:
+                video_ids.append(vid)
+
+        # Videos are independent; fetch their comment pages concurrently, merge in search order.
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+            futures = [pool.submit(_video_comments, vid) for vid in video_ids[:videos]]
+            for fut in futures:
+                try:
+                    items.extend(fut.result())
+                except Exception as e:
+                    errors.append(e)
+        # Only advance when every video was read, or a failed video's new comments would be skipped.
+        if incremental and not errors and (stamps := [it.created_at for it in items if it.created_at is not None]):
+            cursors.set("youtube", ticker, max(stamps).isoformat())
     except Exception as e:
-        warnings.append(f"YouTube fetch failed ({type(e).__name__}); using mock YouTube data.")
+        errors.append(e)
+
+    if errors:
+        warnings.append(f"YouTube fetch failed ({type(errors[0]).__name__}); using mock YouTube data.")
         if not items:
             return mock_items("YouTube", ticker), warnings
 
     return items, warnings
-
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import math
 import re
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 _URL_RE = re.compile(r"https?://\S+|www\.\S+")
-_WS_RE = re.compile(r"\s+")
+_TICKER_RE = re.compile(r"[^A-Z0-9.\-]")
+_UTC = timezone.utc
 
 
 def clean_text(text: str) -> str:
@@ -15,35 +25,159 @@ def clean_text(text: str) -> str:
     Light cleanup suitable for VADER + topic modeling.
     Keep cashtags ($AAPL) and tickers; just remove urls and normalize whitespace.
     """
-    text = _URL_RE.sub("", text or "")
-    text = text.replace("\u200b", " ")
-    text = _WS_RE.sub(" ", text).strip()
-    return text
+    text = text or ""
+    # Common case: no url, and the only whitespace is single spaces (any other
+    # whitespace, and \u200b, makes isprintable() False). Nothing to rewrite.
+    if "http" not in text and "www." not in text and "  " not in text and text.isprintable():
+        return text.strip(" ")
+    text = _URL_RE.sub("", text)
+    # str.split() splits on the same characters as regex \s, in C.
+    return " ".join(text.replace("\u200b", " ").split())
+
+
+def clean_text_batch(texts: Iterable[str | None]) -> list[str]:
+    """
+    clean_text over many strings.
+    """
+    return [clean_text(t) if t else "" for t in texts]
+
+
+def first_seen(seen: set[bytes], text: str) -> bool:
+    """
+    True the first time `text` is offered for a given `seen` set.
+    Stores an 8-byte blake2b digest rather than the text itself.
+    """
+    h = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    if h in seen:
+        return False
+    seen.add(h)
+    return True
 
 
 def utc_from_epoch(seconds: float | int) -> datetime:
-    return datetime.fromtimestamp(float(seconds), tz=timezone.utc)
+    # Reddit sends floats already; only coerce other types.
+    return datetime.fromtimestamp(seconds if type(seconds) is float else float(seconds), _UTC)
+
+
+def parse_iso(ts: str | None) -> datetime | None:
+    """
+    Parse an ISO-8601 / RFC 3339 timestamp such as 2024-01-01T12:34:56Z.
+    Naive values are taken as UTC; missing or unparseable input gives None.
+    """
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=_UTC)
+        return dt
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def http_session() -> requests.Session:
+    """
+    Process-wide session shared by the plain-HTTP sources, so repeated
+    calls reuse pooled keep-alive connections instead of a new TLS handshake.
+    Transient 5xx responses are retried with a short backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    return session
 
 
 def ensure_ticker(ticker: str) -> str:
     t = (ticker or "").strip().upper()
-    return re.sub(r"[^A-Z0-9\.\-]", "", t)
+    return _TICKER_RE.sub("", t)
 
 
 @dataclass
 class RateLimiter:
     """
-    Minimal, per-source rate limiting.
-    Not a strict API quota manager, but helps avoid bursts.
+    Minimal, per-source rate limiting: a token bucket refilled at `rate_per_sec`,
+    allowing bursts of up to `burst` calls. Not a strict API quota manager.
+    Safe to share between worker threads of one source.
+
+    `min_interval_seconds` is kept for existing callers; when given it sets
+    rate_per_sec = 1 / min_interval_seconds.
     """
 
-    min_interval_seconds: float = 1.0
-    _last_ts: float = 0.0
+    min_interval_seconds: float | None = None
+    rate_per_sec: float = 1.0
+    burst: int = 1
+    _tokens: float = field(default=0.0, repr=False, compare=False)
+    _last: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.min_interval_seconds is not None:
+            self.rate_per_sec = 1.0 / self.min_interval_seconds if self.min_interval_seconds > 0 else math.inf
+        # Start full, so the first `burst` calls go straight through.
+        self._tokens = float(self.burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.rate_per_sec)
+        self._last = now
 
     def wait(self) -> None:
-        now = time.time()
-        elapsed = now - self._last_ts
-        if elapsed < self.min_interval_seconds:
-            time.sleep(self.min_interval_seconds - elapsed)
-        self._last_ts = time.time()
+        if math.isinf(self.rate_per_sec):
+            return
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                time.sleep((1.0 - self._tokens) / self.rate_per_sec)
+                self._refill()
+            self._tokens -= 1.0
+
+
+@dataclass
+class HostLimiter:
+    """
+    Caps in-flight requests to one host and paces them with a token bucket.
+    Use as a context manager around each request.
+    """
+
+    max_inflight: int
+    rate: RateLimiter
+    _slots: threading.BoundedSemaphore = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self._slots = threading.BoundedSemaphore(self.max_inflight)
+
+    def __enter__(self) -> "HostLimiter":
+        self._slots.acquire()
+        try:
+            self.rate.wait()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._slots.release()
+
+
+# host -> (max in-flight requests, requests per second), shared by the whole process.
+_HOST_LIMITS = {
+    "oauth.reddit.com": (5, 1.0),
+    "api.stocktwits.com": (4, 1.5),
+    "api.twitter.com": (2, 0.8),
+    "youtube.googleapis.com": (6, 2.0),
+}
+
+
+@lru_cache(maxsize=None)
+def host_limiter(host: str) -> HostLimiter:
+    """
+    Process-wide limiter for `host`, so concurrent fetches (and app sessions)
+    stay within one budget per API. Unknown hosts get a conservative default.
+    """
+    max_inflight, rps = _HOST_LIMITS.get(host, (2, 1.0))
+    return HostLimiter(max_inflight=max_inflight, rate=RateLimiter(rate_per_sec=rps))